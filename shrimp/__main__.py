@@ -57,11 +57,26 @@ class EditorContext:
         self.zen_mode = False
         self.sidebar_visible_before_zen = True
         self.current_theme = "boring"
+        # Set whenever something visible changed and the screen needs a redraw
+        self.dirty = True
+        # Set after something drew over the whole screen (menus, plugins); the next
+        # display() then repaints everything instead of only what changed
+        self.force_redraw = True
+        self.last_frame_state = None
+        self.last_render_key = None
 
         # Input states
         self.normal_number_buffer = ""
         self.last_digit_time = 0
         self.normal_number_timeout = 0.5
+        # getch() wakes up after this many ms so loops can redraw in the background
+        self.input_timeout_ms = 50
+        # The getch() timeout currently in force; curses has no getter, so code
+        # that changes it for a while can put back whatever its caller had
+        self.current_timeout = -1
+        # Minimum time between two frames; keys arriving faster share one redraw
+        self.frame_interval_ms = 30
+        self.last_frame_time = 0.0
         self.word_mode = False
         self.pending_line_change = False
         self.pending_word_change = False
@@ -157,6 +172,11 @@ class EditorContext:
                 # If user’s theme file is broken, ignore it
                 pass
 
+    def set_input_timeout(self, ms: int):
+        """Set the getch() timeout and remember it in current_timeout."""
+        self.current_timeout = ms
+        self.stdscr.timeout(ms)
+
     def log_command(self, msg: str):
         """
         Log a command or action to the sidebar log (and debug log file).
@@ -288,7 +308,7 @@ class EditorContext:
                         theme_name = line.split("=",1)[1].strip()
                         if theme_name:
                             self.apply_theme(theme_name)
-        except:
+        except Exception:
             pass
 
     def save_theme_config(self):
@@ -301,19 +321,20 @@ class EditorContext:
             os.makedirs(os.path.dirname(config_path), exist_ok=True)
             with open(config_path, 'w', encoding='utf-8') as f:
                 f.write(f"theme={self.current_theme}\n")
-        except:
+        except OSError:
             pass
 
 def main(stdscr):
     curses.start_color()
+    ui.screen.init_attrs()
     context = EditorContext(stdscr)
+    context.set_input_timeout(context.input_timeout_ms)
 
     # If started with a filename argument, try to open it
     if len(os.sys.argv) > 1:
         fname = os.sys.argv[1]
         try:
-            with open(fname, 'r', encoding='utf-8') as f:
-                content = f.read().splitlines()
+            content, replaced = buffer.read_lines(fname)
         except FileNotFoundError:
             context.status_message = f"file not found: {fname}"
         except Exception as e:
@@ -323,6 +344,8 @@ def main(stdscr):
             context.buffers[0].lines = content if content else [""]
             context.buffers[0].modified = False
             context.current_buffer = context.buffers[0]
+            if replaced:
+                context.log_command("warning: not valid UTF-8")
 
     # If no file was opened, show the main menu
     if context.current_buffer.filename is None:
@@ -357,10 +380,34 @@ def main(stdscr):
             else:
                 context.status_message = "search string empty."
 
-    # Main loop
+    # Main loop (the startup menus may have cleared the dirty flag)
+    context.dirty = True
     while not context.exit_flag:
-        ui.screen.display(context)
+        if context.dirty:
+            # Draw at most one frame (plugin draw hooks included) per frame interval,
+            # so a burst of keys is handled first and then drawn once
+            wait_ms = context.frame_interval_ms - (time.monotonic() - context.last_frame_time) * 1000
+            if wait_ms <= 0:
+                ui.screen.display(context)
+                context.dirty = False
+                context.last_frame_time = time.monotonic()
+            else:
+                context.set_input_timeout(int(wait_ms) + 1)
         key = context.stdscr.getch()
+        if context.dirty:
+            context.set_input_timeout(context.input_timeout_ms)
+        if key == -1:
+            # Idle tick: only redraw if something expired in the background
+            if context.help_mode_expiry and time.time() > context.help_mode_expiry:
+                context.dirty = True
+            continue
+        if key == curses.KEY_RESIZE:
+            # What the terminal shows after a resize is unknown, so the next frame
+            # clears it and repaints everything instead of sending only changes
+            context.stdscr.clearok(True)
+            context.force_redraw = True
+            context.dirty = True
+            continue
         if context.mode == "normal":
             ui.input.handle_normal_mode(context, key)
         elif context.mode == "insert":
@@ -371,6 +418,7 @@ def main(stdscr):
             ui.input.handle_filetree_mode(context, key)
         elif context.mode == "search":
             ui.input.handle_search_mode(context, key)
+        context.dirty = True
 
         # Timeout numeric prefix if too long
         if (context.normal_number_buffer and
@@ -381,6 +429,12 @@ def run():
     """
     Simple convenience function to start the curses wrapper with main().
     """
+    # ncurses waits ESCDELAY ms (default 1000) after ESC to tell it apart from an
+    # escape sequence, which makes every ESC feel laggy. 25ms is plenty for local
+    # and most remote terminals; the cost is that Alt+key typed with a gap of more
+    # than 25ms arrives as a bare ESC. Must be set before initscr(); a value
+    # already in the environment wins.
+    os.environ.setdefault("ESCDELAY", "25")
     curses.wrapper(main)
 
 if __name__ == "__main__":
@@ -6,6 +6,31 @@ Each Buffer represents an open file or unsaved document with its own cursor posi
 """
 import os
 
+def read_lines(path: str) -> tuple:
+    """
+    Read a file and return (lines, replaced). The file is read as bytes with
+    os.read() and decoded once, instead of going through text-mode IO.
+    Invalid UTF-8 is replaced rather than raising; `replaced` is True when that
+    happened, since saving the buffer would then write U+FFFD over the original
+    bytes.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        # One read covers a regular file; keep going until EOF for short reads
+        # and for files that report size 0 (/proc, FIFOs)
+        chunks = []
+        chunk = os.read(fd, os.fstat(fd).st_size + 1)
+        while chunk:
+            chunks.append(chunk)
+            chunk = os.read(fd, 65536)
+    finally:
+        os.close(fd)
+    data = b"".join(chunks)
+    try:
+        return data.decode('utf-8').splitlines(), False
+    except UnicodeDecodeError:
+        return data.decode('utf-8', errors='replace').splitlines(), True
+
 class Buffer:
     """Represents a text buffer (file content) with editing operations."""
     def __init__(self, filename: str = None, lines=None):
@@ -24,6 +49,17 @@ class Buffer:
         # Scroll offset (top line index visible in the window for this buffer)
         self.scroll = 0
 
+    @property
+    def filename(self):
+        return self._filename
+
+    @filename.setter
+    def filename(self, value):
+        # Keep the display name (status bar, buffer menu) in step with the path
+        # so it isn't re-derived on every frame.
+        self._filename = value
+        self.basename = os.path.basename(value) if value else "new file"
+
     def ensure_not_empty(self):
         """Ensure buffer has at least one empty line (called after deletions)."""
         if len(self.lines) == 0:
@@ -6,6 +6,8 @@ and provides functions to build and flatten a directory tree structure. It also
 functions to load directory contents with optional hidden file filtering.
 """
 import os
+import time
+import curses
 from shrimp import logger
 
 # Icon definitions for file tree display (requires a Nerd Font for proper rendering)
@@ -22,8 +24,11 @@ FILE_ICONS = {
     ".yml": "",
     ".json": "",
     ".lua": "",
+    ".plug": "󰐱",
 }
 DEFAULT_FILE_ICON = ""
+# Minimum seconds between two redraws of the loading counter in load_children()
+PROGRESS_INTERVAL = 0.03
 
 class FileNode:
     """Node in a file tree, representing a file or directory."""
@@ -34,6 +39,20 @@ class FileNode:
         self.parent = parent
         self.children = []     # List of FileNode children (for directories).
         self.expanded = False  # Whether this directory node is expanded in the UI.
+        # Icon and row text are fixed for the node's lifetime, so build them once
+        # here instead of on every redraw. Directories get a (collapsed, expanded) pair.
+        if is_dir:
+            self.icon = FOLDER_SYMBOL
+            self._labels = (f"{FOLDER_ICON_CLOSED}{FOLDER_SYMBOL} {name}",
+                            f"{FOLDER_ICON_OPEN}{FOLDER_SYMBOL} {name}")
+        else:
+            self.icon = FILE_ICONS.get(os.path.splitext(name)[1].lower(), DEFAULT_FILE_ICON)
+            self._labels = (f"   {self.icon} {name}",) * 2
+
+    @property
+    def label(self) -> str:
+        """Display text for this node in the file tree, without indentation."""
+        return self._labels[self.expanded]
 
     def toggle_expanded(self) -> None:
         """Toggle this directory node between expanded and collapsed."""
@@ -55,6 +74,37 @@ def flatten_tree(node: FileNode, depth: int = 0) -> list:
                 stack.insert(0, (child, d + 1))
     return result
 
+def expand_in_flat_list(flat_list: list, index: int) -> None:
+    """
+    Splice the visible subtree of the node at `index` into `flat_list` right
+    after it, instead of re-flattening the whole tree.
+    """
+    node, depth = flat_list[index]
+    flat_list[index + 1:index + 1] = flatten_tree(node, depth)[1:]
+
+def collapse_in_flat_list(flat_list: list, index: int) -> None:
+    """
+    Remove the rows of the subtree below the node at `index` from `flat_list`.
+    The subtree ends at the first following row that is not deeper than the node.
+    """
+    _, depth = flat_list[index]
+    end = index + 1
+    while end < len(flat_list) and flat_list[end][1] > depth:
+        end += 1
+    del flat_list[index + 1:end]
+
+def parent_index(flat_list: list, index: int):
+    """
+    Return the index of the parent row of the node at `index` in `flat_list`,
+    or None for the root. The parent is the nearest row above that is one level
+    shallower, so only the rows between the node and its parent are visited.
+    """
+    depth = flat_list[index][1]
+    for i in range(index - 1, -1, -1):
+        if flat_list[i][1] < depth:
+            return i
+    return None
+
 def load_children(node: FileNode, show_hidden: bool = True, context=None) -> None:
     """
     Load the direct children of the directory represented by `node`.
@@ -80,18 +130,22 @@ def load_children(node: FileNode, show_hidden: bool = True, context=None) -> Non
 
     node.children = []
     total = len(entries)
+
+    def show_progress(done):
+        msg = f" loading... {done}/{total} "
+        logger.safe_addstr(context.stdscr, context.height - 1, max(0, context.width - len(msg)), msg)
+        context.stdscr.noutrefresh()
+        curses.doupdate()
+
     if context:
         # Initial loading message
-        status_y = context.height - 1
-        msg = f" loading... 0/{total} "
-        logger.safe_addstr(context.stdscr, status_y, max(0, context.width - len(msg)), msg)
-        context.stdscr.refresh()
+        show_progress(0)
+        last_shown = time.monotonic()
 
     for i, entry in enumerate(entries):
-        if context:
-            msg = f" loading... {i+1}/{total} "
-            logger.safe_addstr(context.stdscr, context.height - 1, max(0, context.width - len(msg)), msg)
-            context.stdscr.refresh()
+        if context and time.monotonic() - last_shown >= PROGRESS_INTERVAL:
+            show_progress(i + 1)
+            last_shown = time.monotonic()
         child_path = os.path.join(node.path, entry.name)
         is_child_dir = entry.is_dir()
         child_node = FileNode(entry.name, child_path, is_child_dir, parent=node)
@@ -99,9 +153,7 @@ def load_children(node: FileNode, show_hidden: bool = True, context=None) -> Non
 
     if context:
         # Final loading message
-        msg = f" loading... {total}/{total} "
-        logger.safe_addstr(context.stdscr, context.height - 1, max(0, context.width - len(msg)), msg)
-        context.stdscr.refresh()
+        show_progress(total)
 
 def build_tree_iter(root_path: str, show_hidden: bool = True) -> FileNode:
     """
@@ -245,6 +245,9 @@ class PluginManager:
             register_key_handler = lambda *_: None   # placeholder
         )
 
+        # plugins may run their own getch() loops – give them blocking input
+        saved_timeout = ctx.current_timeout
+        ctx.set_input_timeout(-1)
         try:
             if len(inspect.signature(b.func).parameters) == 3:
                 # legacy (ctx, log, status)
@@ -255,6 +258,10 @@ class PluginManager:
             msg = f"plugin '{b.key}' error: {e}"
             ctx.log_command(msg)
             logger.log("[plugins] " + msg)
+        finally:
+            ctx.set_input_timeout(saved_timeout)
+            # the plugin may have drawn anywhere – repaint the whole screen next
+            ctx.force_redraw = True
 
     # ── draw‑hook management ─────────────────────────────
     def _add_draw_hook(self, fn):
@@ -6,7 +6,7 @@ and updates the context accordingly.
 """
 import curses
 import time
-from shrimp import commands, filetree
+from shrimp import buffer, commands, filetree
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -384,7 +384,7 @@ def handle_insert_mode(context, key: int):
             curses.ungetch(k2)
             break
 
-        context.stdscr.nodelay(False)        # restore blocking mode
+        context.stdscr.timeout(context.current_timeout)  # restore input timeout
         return                                # one redraw will show all inserted text
 
 
@@ -443,13 +443,17 @@ def handle_filetree_mode(context, key: int):
         node, depth = context.flat_file_list[context.filetree_selection_index]
         if node.is_dir:
             node.toggle_expanded()
-            if node.expanded and not node.children:
-                filetree.load_children(node, context.show_hidden, context)
-            context.flat_file_list = filetree.flatten_tree(context.file_tree_root)
+            if node.expanded:
+                if not node.children:
+                    filetree.load_children(node, context.show_hidden, context)
+                filetree.expand_in_flat_list(context.flat_file_list,
+                                             context.filetree_selection_index)
+            else:
+                filetree.collapse_in_flat_list(context.flat_file_list,
+                                               context.filetree_selection_index)
         else:
             try:
-                with open(node.path, 'r', encoding='utf-8') as f:
-                    content = f.read().splitlines()
+                content, replaced = buffer.read_lines(node.path)
             except Exception as e:
                 context.status_message = f"error opening file: {e}"
             else:
@@ -460,19 +464,21 @@ def handle_filetree_mode(context, key: int):
                 new_buf.modified = False
                 context.add_buffer(new_buf)
                 context.log_command("file opened: " + node.path)
+                if replaced:
+                    context.log_command("warning: not valid UTF-8")
                 context.mode = "normal"
     elif key == curses.KEY_LEFT:
         node, depth = context.flat_file_list[context.filetree_selection_index]
         if node.is_dir and node.expanded:
             node.toggle_expanded()
-            context.flat_file_list = filetree.flatten_tree(context.file_tree_root)
-        else:
-            if node.parent is not None:
-                # Move selection to the parent node
-                for i, (n, d) in enumerate(context.flat_file_list):
-                    if n == node.parent:
-                        context.filetree_selection_index = i
-                        break
+            filetree.collapse_in_flat_list(context.flat_file_list,
+                                           context.filetree_selection_index)
+        elif node.parent is not None:
+            # Move selection to the parent node
+            parent_idx = filetree.parent_index(context.flat_file_list,
+                                               context.filetree_selection_index)
+            if parent_idx is not None:
+                context.filetree_selection_index = parent_idx
     elif key == ord('a'):
         context.show_hidden = not context.show_hidden
         root_path = context.file_tree_root.path
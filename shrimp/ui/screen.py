@@ -9,28 +9,30 @@ and including the original sidebar, file tree, and dialog methods.
 import os
 import curses
 import time
+import functools
 import subprocess
-from shrimp import logger, filetree
+from itertools import islice
+from shrimp import logger, filetree, buffer
 from shrimp import plugins
-from wcwidth import wcswidth
+from wcwidth import wcswidth, wcwidth
+
+# Height of the full-screen file tree pad, in screens
+FT_PAD_SCREENS = 4
+
+# File tree indentation by depth, built once instead of per visible row
+_INDENTS = tuple("  " * d for d in range(64))
 
-# Icons and symbols
-FOLDER_ICON_CLOSED = " "
-FOLDER_ICON_OPEN   = " "
-FOLDER_SYMBOL      = ""
-FILE_ICONS = {
-    ".py": "",
-    ".md": "",
-    ".txt": "",
-    ".sh": "",
-    ".yaml": "",
-    ".conf": "",
-    ".yml": "",
-    ".json": "",
-    ".lua": "",
-    ".plug": "󰐱",
-}
-DEFAULT_FILE_ICON = ""
+def _indent(depth: int) -> str:
+    return _INDENTS[depth] if depth < 64 else "  " * depth
+
+# Blank strings used to paint region backgrounds, one per width seen
+_blank_cache: dict[int, str] = {}
+
+def _blank(n: int) -> str:
+    s = _blank_cache.get(n)
+    if s is None:
+        s = _blank_cache[n] = " " * n
+    return s
 
 # Command/menu icons and symbols
 CMD_ARROW = "󰘍"
@@ -40,9 +42,78 @@ MENU_DIRECTORY = ""
 MENU_FIND_FILE = ""
 MENU_QUIT      = ""
 
+# Sidebar help text, shown for a few seconds after the h command
+HELP_LIST = (
+    "",
+    "help!",
+    "",
+    "i: insert",
+    "o: cmd",
+    "w: act on word",
+    "d: delete",
+    "y: copy",
+    "u: paste",
+    "h: line start",
+    "j: line end",
+    "p: line change",
+    "wp: word change",
+    "[num]: goto",
+    "[num]y: copy",
+    "[num]d: delete",
+    f"{CMD_ARROW}w: write",
+    f"{CMD_ARROW}c: clearfile",
+    f"{CMD_ARROW}wq: write+quit",
+    f"{CMD_ARROW}q: quit",
+    f"{CMD_ARROW}dir <path>: cd",
+    f"{CMD_ARROW}f: search",
+    f"{CMD_ARROW}tb: tab menu",
+    f"{CMD_ARROW}th: theme switcher",
+    f"{CMD_ARROW}plug: plugin manager",
+    f"{CMD_ARROW}x: next tab",
+    f"{CMD_ARROW}z: prev tab",
+)
+
 # Powerline arrow symbol (classic shape)
 POWERLINE_ARROW = ""
 
+# Frequently used text attributes. color_pair() needs curses colours to be
+# started, so these are filled in once by init_attrs() instead of at import.
+ATTR_TEXT         = 0   # main text area
+ATTR_CUR          = 0   # current line
+ATTR_FT           = 0   # full-screen file tree / menu background
+ATTR_SELECT       = 0   # selected item
+ATTR_DETAIL       = 0   # headers and detail lines
+ATTR_BOX          = 0   # menus, dialogs and the zen status bar
+ATTR_BOX_BOLD     = 0   # menu and dialog borders and titles
+ATTR_SIDEBAR      = 0   # sidebar
+ATTR_SIDEBAR_BOLD = 0   # sidebar mark line
+ATTR_MODE         = 0   # zen mode status segment
+
+def init_attrs():
+    """Compute the ATTR_* constants. Call once after curses.start_color()."""
+    global ATTR_TEXT, ATTR_CUR, ATTR_FT, ATTR_SELECT, ATTR_DETAIL
+    global ATTR_BOX, ATTR_BOX_BOLD, ATTR_SIDEBAR, ATTR_SIDEBAR_BOLD, ATTR_MODE
+    ATTR_TEXT         = curses.color_pair(2)
+    ATTR_CUR          = curses.color_pair(10)
+    ATTR_FT           = curses.color_pair(7)
+    ATTR_SELECT       = curses.color_pair(1) | curses.A_BOLD
+    ATTR_DETAIL       = curses.color_pair(5) | curses.A_BOLD
+    ATTR_BOX          = curses.color_pair(3)
+    ATTR_BOX_BOLD     = curses.color_pair(3) | curses.A_BOLD
+    ATTR_SIDEBAR      = curses.color_pair(4)
+    ATTR_SIDEBAR_BOLD = curses.color_pair(4) | curses.A_BOLD
+    ATTR_MODE         = curses.color_pair(5)
+
+# The clock shown in the sidebar, status bar and main menu only changes once a
+# second, so it is formatted once per second rather than on every frame.
+_clock_cache = [0, ""]
+
+def _cached_hms() -> str:
+    now = int(time.time())
+    if now != _clock_cache[0]:
+        _clock_cache[:] = [now, time.strftime("%H:%M:%S", time.localtime(now))]
+    return _clock_cache[1]
+
 ###############################################################################
 # POWERLINE & THEME FUNCTIONS (New Features)
 ###############################################################################
@@ -217,27 +288,28 @@ def draw_status_bar(context):
         mode_seg = f" {context.mode.upper()} "
         x = 0
         try:
-            context.stdscr.addstr(status_y, x, mode_seg, curses.color_pair(5))
+            context.stdscr.addstr(status_y, x, mode_seg, ATTR_MODE)
         except curses.error:
             pass
         x += len(mode_seg)
         arrow = ""
         try:
-            context.stdscr.addstr(status_y, x, arrow, curses.color_pair(3))
+            context.stdscr.addstr(status_y, x, arrow, ATTR_BOX)
         except curses.error:
             pass
         x += len(arrow)
-        time_seg = f" {time.strftime('%H:%M:%S')} "
+        time_seg = f" {_cached_hms()} "
         time_seg_len = len(time_seg)
-        for pos in range(x, context.width - time_seg_len):
+        gap = context.width - time_seg_len - x
+        if gap > 0:
             try:
-                context.stdscr.addch(status_y, pos, ' ', curses.color_pair(3))
+                context.stdscr.addstr(status_y, x, _blank(gap), ATTR_BOX)
             except curses.error:
                 pass
-        try:
-            context.stdscr.addstr(status_y, context.width - time_seg_len, time_seg, curses.color_pair(3))
-        except curses.error:
-            pass
+        # The clock ends in the bottom-right cell, where addstr() always raises after
+        # writing; insstr() does not move the cursor, and the cells it pushes right
+        # fall off the edge.
+        context.stdscr.insstr(status_y, max(0, context.width - time_seg_len), time_seg, ATTR_BOX)
         return
 
     x = 0
@@ -248,10 +320,9 @@ def draw_status_bar(context):
                                seg_pair=pairs["seg1"],
                                arrow_pair=pairs["arrow1_2"])
     # Draw Filename Segment
-    fname = context.get_current_filename() or "new file"
     dirty_mark = "*" if context.current_buffer.modified else ""
     buf_info = f" [{context.current_buffer_index+1}/{len(context.buffers)}]" if len(context.buffers) > 1 else ""
-    file_text = f" {os.path.basename(fname)}{dirty_mark}{buf_info} "
+    file_text = f" {context.current_buffer.basename}{dirty_mark}{buf_info} "
     x = draw_powerline_segment(context.stdscr, status_y, x,
                                text=file_text,
                                seg_pair=pairs["seg2"],
@@ -265,11 +336,11 @@ def draw_status_bar(context):
                                    seg_pair=pairs["seg3"],
                                    arrow_pair=pairs["arrow3_4"])
     # Prepare Time Segment to be right-aligned.
-    time_text = f" {time.strftime('%H:%M:%S')} "
+    time_text = f" {_cached_hms()} "
     time_text_len = len(time_text)
     if x < context.width - time_text_len:
         filler_length = context.width - time_text_len - x
-        filler_text = " " * filler_length
+        filler_text = _blank(filler_length)
         try:
             context.stdscr.attron(curses.color_pair(pairs["seg4"]))
             context.stdscr.addstr(status_y, x, filler_text)
@@ -279,13 +350,33 @@ def draw_status_bar(context):
         x = context.width - time_text_len
     else:
         x = context.width - time_text_len
-    # Draw Time Segment flush right.
-    try:
-        context.stdscr.attron(curses.color_pair(pairs["seg4"]))
-        context.stdscr.addstr(status_y, x, time_text)
-        context.stdscr.attroff(curses.color_pair(pairs["seg4"]))
-    except curses.error:
-        pass
+    # Draw Time Segment flush right (insstr: see the zen branch above).
+    context.stdscr.insstr(status_y, max(0, x), time_text, curses.color_pair(pairs["seg4"]))
+
+# Only the last few widths are kept: the prompt box grows with the typed text
+@functools.lru_cache(maxsize=32)
+def box_borders(box_width: int) -> tuple:
+    """Return the (top, bottom) border strings for a dialog box of the given width."""
+    return ("┌" + "─" * (box_width - 2) + "┐",
+            "└" + "─" * (box_width - 2) + "┘")
+
+@functools.lru_cache(maxsize=32)
+def dialog_layout(prompt: str, box_width: int, width: int, height: int, box_height: int = 5) -> tuple:
+    """
+    Return (start_y, start_x, top_line, bottom_border) for a prompt dialog of the
+    given width centred on a width x height screen. The top line carries the prompt.
+    """
+    start_y = max(0, (height - box_height) // 2)
+    start_x = max(0, (width - box_width) // 2)
+    top_border, bottom_border = box_borders(box_width)
+    title = f" {prompt} "
+    if len(title) < box_width - 2:
+        title_start = (box_width - 2 - len(title)) // 2
+        top_line = ("┌" + " " * title_start + title +
+                    " " * (box_width - 2 - title_start - len(title)) + "┐")
+    else:
+        top_line = top_border
+    return start_y, start_x, top_line, bottom_border
 
 def draw_centered_cmdline(context):
     """
@@ -296,8 +387,7 @@ def draw_centered_cmdline(context):
     start_y = (context.height - box_height) // 2
     start_x = (context.width - box_width) // 2
 
-    top_border    = "┌" + "─" * (box_width - 2) + "┐"
-    bottom_border = "└" + "─" * (box_width - 2) + "┘"
+    top_border, bottom_border = box_borders(box_width)
     title = " cmdline "
 
     if len(title) < box_width - 2:
@@ -312,9 +402,9 @@ def draw_centered_cmdline(context):
     content_line = "│ " + content + " │"
 
     try:
-        context.stdscr.addstr(start_y, start_x, top_line, curses.color_pair(3) | curses.A_BOLD)
-        context.stdscr.addstr(start_y + 1, start_x, content_line, curses.color_pair(3) | curses.A_BOLD)
-        context.stdscr.addstr(start_y + 2, start_x, bottom_border, curses.color_pair(3) | curses.A_BOLD)
+        context.stdscr.addstr(start_y, start_x, top_line, ATTR_BOX_BOLD)
+        context.stdscr.addstr(start_y + 1, start_x, content_line, ATTR_BOX_BOLD)
+        context.stdscr.addstr(start_y + 2, start_x, bottom_border, ATTR_BOX_BOLD)
     except curses.error:
         pass
 
@@ -322,36 +412,16 @@ def draw_centered_cmdline(context):
 # ORIGINAL SIDEBAR & FILETREE FUNCTIONS (From Original Version)
 ###############################################################################
 
-def draw_segment(context, y, x, text, color_pair, arrow=""):
-    """Helper for drawing a colored text segment with an optional arrow."""
-    try:
-        context.stdscr.attron(curses.color_pair(color_pair))
-        context.stdscr.addstr(y, x, text)
-        context.stdscr.attroff(curses.color_pair(color_pair))
-    except curses.error:
-        pass
-    x += len(text)
-    if arrow:
-        try:
-            context.stdscr.attron(curses.color_pair(color_pair))
-            context.stdscr.addstr(y, x, arrow)
-            context.stdscr.attroff(curses.color_pair(color_pair))
-        except curses.error:
-            pass
-        x += len(arrow)
-    return x
-
 def draw_sidebar(context, sidebar_width):
     """
     Draw the left sidebar if context.sidebar_visible is True.
     In normal mode, displays current time, title, and help or log messages.
     In filetree or search mode, delegates to respective methods.
     """
+    # one hline per row paints the background without building a string
+    fill = ord(' ') | ATTR_SIDEBAR
     for i in range(context.height):
-        try:
-            context.stdscr.addstr(i, 0, " " * sidebar_width, curses.color_pair(4))
-        except curses.error:
-            pass
+        context.stdscr.hline(i, 0, fill, sidebar_width)
 
     if context.mode == "search":
         draw_search_sidebar(context, sidebar_width)
@@ -364,54 +434,21 @@ def draw_sidebar(context, sidebar_width):
         context.sidebar_help_mode = False
         context.help_mode_expiry = None
 
-    y = 0
-    x = 1
-    current_time = time.strftime("%H:%M:%S")
-    x = draw_segment(context, y, x, f" {current_time} ", 4)
-    y += 1
-    header = " shrimp "
-    x = draw_segment(context, y, 1, header, 4)
-    y += 1
-
-    if context.sidebar_help_mode:
-        help_list = [
-            "",
-            "help!",
-            "",
-            "i: insert",
-            "o: cmd",
-            "w: act on word",
-            "d: delete",
-            "y: copy",
-            "u: paste",
-            "h: line start",
-            "j: line end",
-            "p: line change",
-            "wp: word change",
-            "[num]: goto",
-            "[num]y: copy",
-            "[num]d: delete",
-            f"{CMD_ARROW}w: write",
-            f"{CMD_ARROW}c: clearfile",
-            f"{CMD_ARROW}wq: write+quit",
-            f"{CMD_ARROW}q: quit",
-            f"{CMD_ARROW}dir <path>: cd",
-            f"{CMD_ARROW}f: search",
-            f"{CMD_ARROW}tb: tab menu",
-            f"{CMD_ARROW}th: theme switcher",
-            f"{CMD_ARROW}plug: plugin manager",
-            f"{CMD_ARROW}x: next tab",
-            f"{CMD_ARROW}z: prev tab",
-        ]
-        messages = help_list
-    else:
-        messages = context.sidebar_log
+    # clock and title
+    try:
+        context.stdscr.addstr(0, 1, f" {_cached_hms()} ", ATTR_SIDEBAR)
+        context.stdscr.addstr(1, 1, " shrimp ", ATTR_SIDEBAR)
+    except curses.error:
+        pass
+    y = 2
+
+    messages = HELP_LIST if context.sidebar_help_mode else context.sidebar_log
 
     for msg in messages:
         if y >= context.height:
             break
         try:
-            context.stdscr.addstr(y, 1, msg[:sidebar_width-2], curses.color_pair(4))
+            context.stdscr.addnstr(y, 1, msg, sidebar_width-2, ATTR_SIDEBAR)
         except curses.error:
             pass
         y += 1
@@ -421,24 +458,20 @@ def draw_sidebar(context, sidebar_width):
         mark_text = f"mark on line {mark_line+1}"
         mark_y = context.height - 2
         try:
-            context.stdscr.addstr(mark_y, 0, " " * sidebar_width, curses.color_pair(4))
+            context.stdscr.addstr(mark_y, 0, _blank(sidebar_width), ATTR_SIDEBAR)
         except curses.error:
             pass
         try:
-            context.stdscr.addstr(mark_y, 1, mark_text[:sidebar_width-2],
-                                  curses.color_pair(4) | curses.A_BOLD)
+            context.stdscr.addnstr(mark_y, 1, mark_text, sidebar_width-2,
+                                  ATTR_SIDEBAR_BOLD)
         except curses.error:
             pass
 
 def draw_filetree(context, sidebar_width):
     """
     Draw the file tree in the sidebar for filetree mode.
+    The background is already painted by draw_sidebar().
     """
-    for i in range(context.height):
-        try:
-            context.stdscr.addstr(i, 0, " " * sidebar_width, curses.color_pair(4))
-        except curses.error:
-            pass
 
     available = context.height - 2
     if context.filetree_selection_index < context.filetree_scroll_offset:
@@ -446,33 +479,26 @@ def draw_filetree(context, sidebar_width):
     elif context.filetree_selection_index >= context.filetree_scroll_offset + available:
         context.filetree_scroll_offset = context.filetree_selection_index - available + 1
 
-    y = 0
-    x = 1
     heading = f"{context.mode_icons.get('filetree','')} file tree"
-    x = draw_segment(context, y, x, f" {heading} ", 4)
-    y += 1
-    x = draw_segment(context, y, 1, f" root: {context.file_tree_root.path} ", 4)
-    y += 1
-
-    for idx, (node, depth) in enumerate(context.flat_file_list[context.filetree_scroll_offset:]):
-        if y >= context.height:
-            break
-        is_selected = (idx + context.filetree_scroll_offset == context.filetree_selection_index)
-        indent = "  " * depth
-        if node.is_dir:
-            arrow_icon = FOLDER_ICON_OPEN if node.expanded else FOLDER_ICON_CLOSED
-            display_text = f"{indent}{arrow_icon}{FOLDER_SYMBOL} {node.name}"
-        else:
-            _, ext = os.path.splitext(node.name)
-            file_icon = FILE_ICONS.get(ext.lower(), DEFAULT_FILE_ICON)
-            display_text = f"{indent}   {file_icon} {node.name}"
+    try:
+        context.stdscr.addstr(0, 1, f" {heading} ", ATTR_SIDEBAR)
+        context.stdscr.addstr(1, 1, f" root: {context.file_tree_root.path} ", ATTR_SIDEBAR)
+    except curses.error:
+        pass
+    y = 2
+
+    # per-frame constants bound to locals for the row loop
+    addnstr = context.stdscr.addnstr
+    attr_normal = ATTR_SIDEBAR
+    height = context.height
+    scroll = context.filetree_scroll_offset
+    selected = context.filetree_selection_index
+    # only the rows that fit below the two header lines
+    rows = islice(context.flat_file_list, scroll, scroll + max(0, height - y))
+    for idx, (node, depth) in enumerate(rows):
         try:
-            if is_selected:
-                context.stdscr.addstr(y, 1, display_text[:sidebar_width-2],
-                                      curses.color_pair(1) | curses.A_BOLD)
-            else:
-                context.stdscr.addstr(y, 1, display_text[:sidebar_width-2],
-                                      curses.color_pair(4))
+            addnstr(y, 1, _indent(depth) + node.label, sidebar_width-2,
+                    ATTR_SELECT if idx + scroll == selected else attr_normal)
         except curses.error:
             pass
         y += 1
@@ -480,41 +506,59 @@ def draw_filetree(context, sidebar_width):
 def draw_search_sidebar(context, sidebar_width):
     """
     Draw the sidebar for search mode, showing match lines and snippets.
+    The background is already painted by draw_sidebar().
     """
-    for i in range(context.height):
-        try:
-            context.stdscr.addstr(i, 0, " " * sidebar_width, curses.color_pair(4))
-        except curses.error:
-            pass
 
     header = f" search: '{context.search_query}' "
     try:
-        context.stdscr.addstr(0, 1, header, curses.color_pair(5) | curses.A_BOLD)
+        context.stdscr.addstr(0, 1, header, ATTR_DETAIL)
     except curses.error:
         pass
 
-    for idx, line_num in enumerate(context.search_results):
-        lines = context.get_current_lines()
-        snippet = lines[line_num] if line_num < len(lines) else ""
+    lines = context.get_current_lines()
+    n_lines = len(lines)
+    addnstr = context.stdscr.addnstr
+    attr_normal = ATTR_SIDEBAR
+    selected = context.search_selected_index
+    # rows below the screen would only raise curses.error, so stop at the bottom
+    for idx, line_num in enumerate(context.search_results[:context.height - 1]):
+        snippet = lines[line_num] if line_num < n_lines else ""
         snippet = snippet.strip()
         display = f"{line_num+1}: {snippet}"
-        if idx == context.search_selected_index:
-            try:
-                context.stdscr.addstr(idx+1, 1, display[:sidebar_width-2],
-                                      curses.color_pair(1) | curses.A_BOLD)
-            except curses.error:
-                pass
-        else:
-            try:
-                context.stdscr.addstr(idx+1, 1, display[:sidebar_width-2],
-                                      curses.color_pair(4))
-            except curses.error:
-                pass
+        try:
+            addnstr(idx+1, 1, display, sidebar_width-2,
+                    ATTR_SELECT if idx == selected else attr_normal)
+        except curses.error:
+            pass
 
 ###############################################################################
 # OTHER UI FUNCTIONS (Menus, Fullscreen Filetree, Editor Display and Prompt)
 ###############################################################################
 
+def full_screen(func):
+    """
+    Decorator for UIs that take over the whole screen: once they return, the
+    next display() has to repaint everything rather than only what changed.
+    """
+    @functools.wraps(func)
+    def wrapper(context, *args, **kwargs):
+        try:
+            return func(context, *args, **kwargs)
+        finally:
+            # screens that blank themselves through bkgdset() + erase() leave
+            # that background behind; put back the plain one display() expects
+            context.stdscr.bkgdset(' ', 0)
+            context.force_redraw = True
+    return wrapper
+
+def wait_key(context):
+    """Block until a real key arrives, skipping the idle getch() timeouts."""
+    key = context.stdscr.getch()
+    while key == -1:
+        key = context.stdscr.getch()
+    return key
+
+@full_screen
 def show_buffer_menu(context):
     """
     Display a vertical buffer menu and return the selected buffer index or None if canceled.
@@ -522,37 +566,38 @@ def show_buffer_menu(context):
     items = []
     for i, buf in enumerate(context.buffers):
         star = "*" if buf.modified else " "
-        label = f"{i+1:2d}{star} {os.path.basename(buf.filename or 'new file')}"
+        label = f"{i+1:2d}{star} {buf.basename}"
         items.append(label)
 
     selected = 0
     height = len(items) + 4
-    width = max(len(x) for x in items) + 6
+    width = max(map(len, items)) + 6
     height = min(height, context.height)
     width = min(width, context.width)
     start_y = max(0, (context.height - height) // 2)
     start_x = max(0, (context.width - width) // 2)
 
-    while True:
-        try:
-            for r in range(height):
-                context.stdscr.addstr(start_y + r, start_x, " " * width, curses.color_pair(3))
-        except curses.error:
-            pass
-
-        title = "Switch buffer"
-        border_top = "┌" + "─" * (width - 2) + "┐"
-        border_bottom = "└" + "─" * (width - 2) + "┘"
-        try:
-            context.stdscr.addstr(start_y, start_x, border_top, curses.color_pair(3) | curses.A_BOLD)
-            context.stdscr.addstr(start_y, start_x + (width - len(title)) // 2, title,
-                                  curses.color_pair(3) | curses.A_BOLD)
-            context.stdscr.addstr(start_y + height - 1, start_x, border_bottom,
-                                  curses.color_pair(3) | curses.A_BOLD)
-        except curses.error:
-            pass
-
+    # The box background and frame never change while the menu is open, so
+    # they are drawn once; the loop only rewrites the item rows.
+    fill = ord(' ') | ATTR_BOX
+    try:
+        for r in range(1, height - 1):
+            context.stdscr.hline(start_y + r, start_x, fill, width)
+    except curses.error:
+        pass
+    title = "Switch buffer"
+    border_top = "┌" + "─" * (width - 2) + "┐"
+    border_bottom = "└" + "─" * (width - 2) + "┘"
+    try:
+        context.stdscr.addstr(start_y, start_x, border_top, ATTR_BOX_BOLD)
+        context.stdscr.addstr(start_y, start_x + (width - len(title)) // 2, title,
+                              ATTR_BOX_BOLD)
+        context.stdscr.addstr(start_y + height - 1, start_x, border_bottom,
+                              ATTR_BOX_BOLD)
+    except curses.error:
+        pass
 
+    while True:
         for idx, label in enumerate(items):
             row_y = start_y + 1 + idx
             if row_y >= start_y + height - 1:
@@ -560,18 +605,19 @@ def show_buffer_menu(context):
             if idx == selected:
                 try:
                     context.stdscr.addstr(row_y, start_x + 1, label.ljust(width - 2),
-                                          curses.color_pair(1) | curses.A_BOLD)
+                                          ATTR_SELECT)
                 except curses.error:
                     pass
             else:
                 try:
                     context.stdscr.addstr(row_y, start_x + 1, label.ljust(width - 2),
-                                          curses.color_pair(3))
+                                          ATTR_BOX)
                 except curses.error:
                     pass
 
-        context.stdscr.refresh()
-        key = context.stdscr.getch()
+        context.stdscr.noutrefresh()
+        curses.doupdate()
+        key = wait_key(context)
         if key == curses.KEY_UP:
             selected = (selected - 1) % len(items)
         elif key == curses.KEY_DOWN:
@@ -585,6 +631,27 @@ import time
 import curses
 from wcwidth import wcswidth
 
+# Main menu content never changes, so it is split and measured once at import
+# instead of on every menu redraw.
+MAIN_MENU_ITEMS = [
+    {"label": "new file",      "shortcut": "n", "icon": MENU_NEW_FILE},
+    {"label": "open filetree", "shortcut": "t", "icon": MENU_FILE_TREE},
+    {"label": "open directory","shortcut": "d", "icon": MENU_DIRECTORY},
+    {"label": "search",        "shortcut": "f", "icon": MENU_FIND_FILE},
+    {"label": "quit",          "shortcut": "q", "icon": MENU_QUIT},
+]
+ASCII_LOGO = (
+    "               _          _             \n"
+    "        \\ \\     ___| |__  _ __(_)_ __ ___  _ __  \n"
+    "-==-_    / /   / __| '_ \\| '__| | '_ ` _ \\| '_ \\ \n"
+    "  ==== =/_/    \\__ \\ | | | |  | | | | | | | |_) |\n"
+    "    ==== *    |___/_| |_|_|  |_|_| |_| |_| .__/\n"
+    " ////||\\\\\\\\                             |_|  "
+)
+_LOGO_LINES = tuple((line, wcswidth(line)) for line in ASCII_LOGO.strip("\n").splitlines())
+_MENU_LABELS = tuple(f" {item['icon']} {item['label']} [{item['shortcut'].upper()}] "
+                     for item in MAIN_MENU_ITEMS)
+
 def pad_line(text, width):
     """Pad or trim a string to match the visual width."""
     visual_width = wcswidth(text)
@@ -592,105 +659,80 @@ def pad_line(text, width):
         return text[:width]
     return text + " " * (width - visual_width)
 
+@full_screen
 def show_main_menu(context):
     """
     Full-screen main menu for new file, filetree, directory, search, or quit.
     Returns the chosen shortcut as a string or None if canceled.
     """
-    menu_items = [
-        {"label": "new file",      "shortcut": "n", "icon": MENU_NEW_FILE},
-        {"label": "open filetree", "shortcut": "t", "icon": MENU_FILE_TREE},
-        {"label": "open directory","shortcut": "d", "icon": MENU_DIRECTORY},
-        {"label": "search",        "shortcut": "f", "icon": MENU_FIND_FILE},
-        {"label": "quit",          "shortcut": "q", "icon": MENU_QUIT},
-    ]
-
     selected = 0
-    ascii_logo = (
-    "               _          _             \n"
-    "        \\ \\     ___| |__  _ __(_)_ __ ___  _ __  \n"
-    "-==-_    / /   / __| '_ \\| '__| | '_ ` _ \\| '_ \\ \n"
-    "  ==== =/_/    \\__ \\ | | | |  | | | | | | | |_) |\n"
-    "    ==== *    |___/_| |_|_|  |_|_| |_| |_| .__/\n"
-    " ////||\\\\\\\\                             |_|  "
-)
-
-
-
     while True:
+        # Background fill: clear() paints every cell with the background set here
+        context.stdscr.bkgdset(' ', ATTR_FT)
         context.stdscr.clear()
         height, width = context.height, context.width
 
-        # Background fill
-        for y in range(height):
-            try:
-                context.stdscr.addstr(y, 0, " " * width, curses.color_pair(7))
-            except curses.error:
-                pass
-
         # Display logo
-        from wcwidth import wcswidth
+        start_y = max(0, (context.height - len(_LOGO_LINES)) // 2)
 
-        logo_lines = ascii_logo.strip("\n").splitlines()
-        start_y = max(0, (context.height - len(logo_lines)) // 2)
-
-        for i, line in enumerate(logo_lines):
-            x = max(0, (context.width - wcswidth(line)) // 2)
+        for i, (line, line_width) in enumerate(_LOGO_LINES):
+            x = max(0, (context.width - line_width) // 2)
             try:
-                context.stdscr.addstr(start_y + i, x, line, curses.color_pair(7))
+                context.stdscr.addstr(start_y + i, x, line, ATTR_FT)
             except curses.error:
                 pass
 
         # Clock display
-        current_time = time.strftime("%H:%M:%S")
+        current_time = _cached_hms()
         time_line = f" {current_time} "
         try:
             context.stdscr.addstr(start_y - 2,
                                   max(0, (width - wcswidth(time_line)) // 2),
-                                  time_line, curses.color_pair(7))
+                                  time_line, ATTR_FT)
         except curses.error:
             pass
 
         # Title
         menu_title = "menu..."
         try:
-            context.stdscr.addstr(start_y + len(logo_lines) + 1,
+            context.stdscr.addstr(start_y + len(_LOGO_LINES) + 1,
                                   max(0, (width - wcswidth(menu_title)) // 2),
-                                  menu_title, curses.color_pair(7) | curses.A_BOLD)
+                                  menu_title, ATTR_FT | curses.A_BOLD)
         except curses.error:
             pass
 
         # Menu entries
-        start_y_menu = start_y + len(logo_lines) + 3
-        for idx, item in enumerate(menu_items):
-            line = f" {item['icon']} {item['label']} [{item['shortcut'].upper()}] "
+        start_y_menu = start_y + len(_LOGO_LINES) + 3
+        for idx, line in enumerate(_MENU_LABELS):
             x = max(0, (width - wcswidth(line)) // 2)
             try:
                 if idx == selected:
-                    context.stdscr.attron(curses.color_pair(7) | curses.A_BOLD)
+                    context.stdscr.attron(ATTR_FT | curses.A_BOLD)
                     context.stdscr.addstr(start_y_menu + idx * 2, x, pad_line(line, width))
-                    context.stdscr.attroff(curses.color_pair(7) | curses.A_BOLD)
+                    context.stdscr.attroff(ATTR_FT | curses.A_BOLD)
                 else:
-                    context.stdscr.addstr(start_y_menu + idx * 2, x, pad_line(line, width), curses.color_pair(7))
+                    context.stdscr.addstr(start_y_menu + idx * 2, x, pad_line(line, width), ATTR_FT)
             except curses.error:
                 pass
 
-        context.stdscr.refresh()
-        key = context.stdscr.getch()
+        context.stdscr.noutrefresh()
+        curses.doupdate()
+        key = wait_key(context)
 
         if key in (curses.KEY_UP, ord('k')):
-            selected = (selected - 1) % len(menu_items)
+            selected = (selected - 1) % len(MAIN_MENU_ITEMS)
         elif key in (curses.KEY_DOWN, ord('j')):
-            selected = (selected + 1) % len(menu_items)
+            selected = (selected + 1) % len(MAIN_MENU_ITEMS)
         elif key in (curses.KEY_ENTER, 10, 13):
-            return menu_items[selected]["shortcut"]
+            return MAIN_MENU_ITEMS[selected]["shortcut"]
         elif key >= 0:
             c = chr(key).lower()
-            for item in menu_items:
+            for item in MAIN_MENU_ITEMS:
                 if c == item["shortcut"]:
                     return item["shortcut"]
 
 
+@full_screen
 def show_theme_menu(context):
     """
     Show a small box with available themes for the user to select.
@@ -704,36 +746,39 @@ def show_theme_menu(context):
     width = 30
     start_y = max(0, (context.height - height) // 2)
     start_x = max(0, (context.width - width) // 2)
+    # background and frame are drawn once, as in show_buffer_menu()
+    fill = ord(' ') | ATTR_BOX
+    try:
+        for r in range(1, height - 1):
+            context.stdscr.hline(start_y + r, start_x, fill, width)
+    except curses.error:
+        pass
+    title = " Theme Menu "
+    border_top = "┌" + "─" * (width - 2) + "┐"
+    border_bottom = "└" + "─" * (width - 2) + "┘"
+    try:
+        context.stdscr.addstr(start_y, start_x, border_top, ATTR_BOX_BOLD)
+        pos_title = start_x + (width - len(title)) // 2
+        context.stdscr.addstr(start_y, pos_title, title, ATTR_BOX_BOLD)
+        context.stdscr.addstr(start_y + height - 1, start_x, border_bottom, ATTR_BOX_BOLD)
+    except curses.error:
+        pass
     while True:
-        try:
-            for r in range(height):
-                context.stdscr.addstr(start_y + r, start_x, " " * width, curses.color_pair(3))
-        except curses.error:
-            pass
-        title = " Theme Menu "
-        border_top = "┌" + "─" * (width - 2) + "┐"
-        border_bottom = "└" + "─" * (width - 2) + "┘"
-        try:
-            context.stdscr.addstr(start_y, start_x, border_top, curses.color_pair(3) | curses.A_BOLD)
-            pos_title = start_x + (width - len(title)) // 2
-            context.stdscr.addstr(start_y, pos_title, title, curses.color_pair(3) | curses.A_BOLD)
-            context.stdscr.addstr(start_y + height - 1, start_x, border_bottom, curses.color_pair(3) | curses.A_BOLD)
-        except curses.error:
-            pass
         for i, th in enumerate(themes):
             row_y = start_y + 1 + i
             if i == selected:
                 line = f"> {th}"
-                style = curses.color_pair(1) | curses.A_BOLD
+                style = ATTR_SELECT
             else:
                 line = f"  {th}"
-                style = curses.color_pair(3)
+                style = ATTR_BOX
             try:
                 context.stdscr.addstr(row_y, start_x + 1, line.ljust(width - 2), style)
             except curses.error:
                 pass
-        context.stdscr.refresh()
-        key = context.stdscr.getch()
+        context.stdscr.noutrefresh()
+        curses.doupdate()
+        key = wait_key(context)
         if key == curses.KEY_UP:
             selected = (selected - 1) % len(themes)
         elif key == curses.KEY_DOWN:
@@ -747,6 +792,7 @@ def show_theme_menu(context):
         elif key == 27:
             return
 
+@full_screen
 def show_plugin_menu(context):
     """
     Hierarchical plugin manager:
@@ -766,63 +812,75 @@ def show_plugin_menu(context):
 
     sel_p, sel_b = 0, None          # selected plugin / bind
     detail_text = ""                # text shown on bottom line
+    row_cache = {}                  # (plugin, bind) -> (state, padded row text)
 
+    context.dirty = True
     while True:
-        h, w = context.height, context.width
+        if context.dirty:
+            h, w = context.height, context.width
 
-        # ── themed background ────────────────────────────────────────────
-        for y in range(h):
-            try:
-                context.stdscr.addstr(y, 0, " " * w, curses.color_pair(7))
-            except curses.error:
-                pass
-
-        # ── header ──────────────────────────────────────────────────────
-        title = " Plugin Manager (Enter toggle • Tab expand • d details) "
-        try:
-            context.stdscr.addstr(
-                0, max(0, (w - len(title)) // 2),
-                title, curses.color_pair(5) | curses.A_BOLD)
-        except curses.error:
-            pass
+            # ── themed background ────────────────────────────────────────────
+            context.stdscr.bkgdset(' ', ATTR_FT)
+            context.stdscr.erase()
 
-        # ── list ────────────────────────────────────────────────────────
-        row = 2
-        for p_idx, pl in enumerate(pm.plugins):
-            arrow = "▾" if pl.expanded else "▸"
-            state = "✔" if pl.enabled else "✖"
-            line = f"{arrow} [{state}] {pl.name}"
-            style = curses.color_pair(1) | curses.A_BOLD \
-                    if (p_idx == sel_p and sel_b is None) else curses.color_pair(3)
-            try:
-                context.stdscr.addstr(row, 2, line.ljust(w - 4), style)
-            except curses.error:
-                pass
-            row += 1
-
-            if pl.expanded:
-                for b_idx, bd in enumerate(pl.binds):
-                    state_b = "✔" if bd.enabled else "✖"
-                    line_b = f"    [{state_b}] {bd.key_or_cmd} ({bd.mode})"
-                    style_b = curses.color_pair(1) | curses.A_BOLD \
-                              if (p_idx == sel_p and sel_b == b_idx) else curses.color_pair(3)
-                    try:
-                        context.stdscr.addstr(row, 2, line_b.ljust(w - 4), style_b)
-                    except curses.error:
-                        pass
-                    row += 1
-
-        # ── detail line (bottom) ────────────────────────────────────────
-        if detail_text:
+            # ── header ──────────────────────────────────────────────────────
+            title = " Plugin Manager (Enter toggle • Tab expand • d details) "
             try:
                 context.stdscr.addstr(
-                    h - 1, 2, detail_text[:w - 4],
-                    curses.color_pair(5) | curses.A_BOLD)
+                    0, max(0, (w - len(title)) // 2),
+                    title, ATTR_DETAIL)
             except curses.error:
                 pass
 
-        context.stdscr.refresh()
+            # ── list ────────────────────────────────────────────────────────
+            row = 2
+            # row text only changes when its plugin/bind is toggled or expanded,
+            # so moving the selection reuses the cached strings
+            for p_idx, pl in enumerate(pm.plugins):
+                cached = row_cache.get((p_idx, None))
+                if cached is None or cached[0] != (pl.expanded, pl.enabled, w):
+                    arrow = "▾" if pl.expanded else "▸"
+                    state = "✔" if pl.enabled else "✖"
+                    line = f"{arrow} [{state}] {pl.name}"
+                    cached = row_cache[(p_idx, None)] = ((pl.expanded, pl.enabled, w), line.ljust(w - 4))
+                style = ATTR_SELECT \
+                        if (p_idx == sel_p and sel_b is None) else ATTR_BOX
+                try:
+                    context.stdscr.addstr(row, 2, cached[1], style)
+                except curses.error:
+                    pass
+                row += 1
+
+                if pl.expanded:
+                    for b_idx, bd in enumerate(pl.binds):
+                        cached = row_cache.get((p_idx, b_idx))
+                        if cached is None or cached[0] != (bd.enabled, w):
+                            state_b = "✔" if bd.enabled else "✖"
+                            line_b = f"    [{state_b}] {bd.key_or_cmd} ({bd.mode})"
+                            cached = row_cache[(p_idx, b_idx)] = ((bd.enabled, w), line_b.ljust(w - 4))
+                        style_b = ATTR_SELECT \
+                                  if (p_idx == sel_p and sel_b == b_idx) else ATTR_BOX
+                        try:
+                            context.stdscr.addstr(row, 2, cached[1], style_b)
+                        except curses.error:
+                            pass
+                        row += 1
+
+            # ── detail line (bottom) ────────────────────────────────────────
+            # insnstr() does not advance the cursor, so the bottom-right cell is
+            # safe; it still fails if the screen shrank while the menu was open
+            if detail_text:
+                try:
+                    context.stdscr.insnstr(h - 1, 2, detail_text, w - 4, ATTR_DETAIL)
+                except curses.error:
+                    pass
+
+            context.stdscr.noutrefresh()
+            curses.doupdate()
+            context.dirty = False
         k = context.stdscr.getch()
+        if k == -1:
+            continue
 
         # ── navigation ─────────────────────────────────────────────────
         if k in (curses.KEY_UP, ord('k')):
@@ -832,6 +890,7 @@ def show_plugin_menu(context):
                     sel_b = None
             else:
                 sel_p = (sel_p - 1) % len(pm.plugins)
+            context.dirty = True
 
         elif k in (curses.KEY_DOWN, ord('j')):
             if sel_b is None and pm.plugins[sel_p].expanded and pm.plugins[sel_p].binds:
@@ -843,6 +902,7 @@ def show_plugin_menu(context):
                     sel_p = (sel_p + 1) % len(pm.plugins)
             else:
                 sel_p = (sel_p + 1) % len(pm.plugins)
+            context.dirty = True
 
         # ── toggle ─────────────────────────────────────────────────────
         elif k in (curses.KEY_ENTER, 10):
@@ -851,12 +911,14 @@ def show_plugin_menu(context):
             else:
                 pm.toggle_bind(sel_p, sel_b)
             detail_text = ""
+            context.dirty = True
 
         # ── expand/collapse ────────────────────────────────────────────
         elif k == ord('\t'):
             pm.plugins[sel_p].expanded = not pm.plugins[sel_p].expanded
             sel_b = None
             detail_text = ""
+            context.dirty = True
 
         # ── show details ───────────────────────────────────────────────
         elif k == ord('d'):
@@ -866,69 +928,104 @@ def show_plugin_menu(context):
             else:
                 b = pm.plugins[sel_p].binds[sel_b]
                 detail_text = f"{b.title or b.key_or_cmd}: {b.desc or '(no description)'}"
+            context.dirty = True
 
         # ── quit ───────────────────────────────────────────────────────
         elif k == 27:   # ESC
             return
 
 
+@full_screen
 def show_full_filetree(context):
     """
     Show a full-screen file tree browser and return once a file is selected.
+
+    Tree rows are drawn into a pad a few screens tall that holds the part of
+    the list around the scroll position. Moving the selection only repaints
+    the old and new selected rows, and scrolling within the pad only changes
+    which part of it is copied to the screen.
     """
     scroll_offset = 0
     ft_width = 60
+    ft_pad = None
+    pad_top = 0
+    pad_rows = 0
+    pad_stale = True
+    win_size = None
+    drawn_sel = None
+    context.dirty = True
+
+    def draw_row(index, attr):
+        if not pad_top <= index < min(pad_top + pad_rows, len(context.flat_file_list)):
+            return
+        node, depth = context.flat_file_list[index]
+        try:
+            ft_pad.addnstr(index - pad_top, 1, _indent(depth) + node.label, pad_width - 2, attr)
+        except curses.error:
+            pass
+
     while True:
-        context.stdscr.clear()
-        x_offset = max(0, (context.width - ft_width) // 2)
-        for y in range(context.height):
-            try:
-                context.stdscr.addstr(y, x_offset, " " * ft_width, curses.color_pair(7))
-            except curses.error:
-                pass
-        visible_items = context.flat_file_list[scroll_offset: scroll_offset + context.height]
-        y = 0
-        for idx, (node, depth) in enumerate(visible_items):
-            indent = "  " * depth
-            if node.is_dir:
-                arrow_icon = FOLDER_ICON_OPEN if node.expanded else FOLDER_ICON_CLOSED
-                display_text = f"{indent}{arrow_icon}{FOLDER_SYMBOL} {node.name}"
-            else:
-                _, ext = os.path.splitext(node.name)
-                file_icon = FILE_ICONS.get(ext.lower(), DEFAULT_FILE_ICON)
-                display_text = f"{indent}   {file_icon} {node.name}"
-            if idx + scroll_offset == context.filetree_selection_index:
-                try:
-                    context.stdscr.addstr(y, x_offset + 1, display_text[:ft_width - 2],
-                                          curses.color_pair(1) | curses.A_BOLD)
-                except curses.error:
-                    pass
-            else:
-                try:
-                    context.stdscr.addstr(y, x_offset + 1, display_text[:ft_width - 2],
-                                          curses.color_pair(7))
-                except curses.error:
-                    pass
-            y += 1
-        context.stdscr.refresh()
+        if context.dirty:
+            if win_size != (context.height, context.width):
+                win_size = (context.height, context.width)
+                x_offset = max(0, (context.width - ft_width) // 2)
+                pad_width = min(ft_width, context.width - x_offset)
+                pad_rows = FT_PAD_SCREENS * context.height
+                context.stdscr.erase()
+                context.stdscr.noutrefresh()
+                ft_pad = curses.newpad(pad_rows, pad_width)
+                ft_pad.bkgd(' ', ATTR_FT)
+                pad_stale = True
+            if not pad_top <= scroll_offset <= pad_top + pad_rows - context.height:
+                pad_stale = True
+            sel = context.filetree_selection_index
+            if pad_stale:
+                # Start the page a screen above the view so paging up a little
+                # does not need a redraw either.
+                pad_top = max(0, scroll_offset - context.height)
+                ft_pad.erase()
+                for i in range(pad_top, min(pad_top + pad_rows, len(context.flat_file_list))):
+                    draw_row(i, ATTR_SELECT if i == sel else ATTR_FT)
+                pad_stale = False
+            elif drawn_sel != sel:
+                draw_row(drawn_sel, ATTR_FT)
+                draw_row(sel, ATTR_SELECT)
+            drawn_sel = sel
+            ft_pad.noutrefresh(scroll_offset - pad_top, 0, 0, x_offset,
+                               context.height - 1, x_offset + pad_width - 1)
+            curses.doupdate()
+            context.dirty = False
         key = context.stdscr.getch()
+        if key == -1:
+            continue
         if key == curses.KEY_UP:
             if context.filetree_selection_index > 0:
                 context.filetree_selection_index -= 1
+                context.dirty = True
         elif key == curses.KEY_DOWN:
             if context.filetree_selection_index < len(context.flat_file_list) - 1:
                 context.filetree_selection_index += 1
+                context.dirty = True
         elif key in (curses.KEY_ENTER, 10, curses.KEY_RIGHT):
             node, _ = context.flat_file_list[context.filetree_selection_index]
             if node.is_dir:
                 node.toggle_expanded()
-                if node.expanded and not node.children:
-                    filetree.load_children(node, context.show_hidden, context)
-                context.flat_file_list = filetree.flatten_tree(context.file_tree_root)
+                if node.expanded:
+                    if not node.children:
+                        filetree.load_children(node, context.show_hidden, context)
+                        # Go through the erase path so the loading counter
+                        # load_children left on stdscr is cleared.
+                        win_size = None
+                    filetree.expand_in_flat_list(context.flat_file_list,
+                                                 context.filetree_selection_index)
+                else:
+                    filetree.collapse_in_flat_list(context.flat_file_list,
+                                                   context.filetree_selection_index)
+                pad_stale = True
+                context.dirty = True
             else:
                 try:
-                    with open(node.path, 'r', encoding='utf-8') as f:
-                        content = f.read().splitlines()
+                    content, replaced = buffer.read_lines(node.path)
                 except Exception as e:
                     context.status_message = f"error opening file: {e}"
                 else:
@@ -936,18 +1033,23 @@ def show_full_filetree(context):
                     new_buf.modified = False
                     context.add_buffer(new_buf)
                     context.log_command("file opened: " + node.path)
+                    if replaced:
+                        context.log_command("warning: not valid UTF-8")
                 context.mode = "normal"
                 return
         elif key == curses.KEY_LEFT:
             node, _ = context.flat_file_list[context.filetree_selection_index]
             if node.is_dir and node.expanded:
                 node.toggle_expanded()
-                context.flat_file_list = filetree.flatten_tree(context.file_tree_root)
+                filetree.collapse_in_flat_list(context.flat_file_list,
+                                               context.filetree_selection_index)
+                pad_stale = True
             elif node.parent is not None:
-                for i, (n, _) in enumerate(context.flat_file_list):
-                    if n == node.parent:
-                        context.filetree_selection_index = i
-                        break
+                parent_idx = filetree.parent_index(context.flat_file_list,
+                                                   context.filetree_selection_index)
+                if parent_idx is not None:
+                    context.filetree_selection_index = parent_idx
+            context.dirty = True
         elif key == ord('a'):
             context.show_hidden = not context.show_hidden
             root_path = context.file_tree_root.path
@@ -956,49 +1058,128 @@ def show_full_filetree(context):
             filetree.load_children(context.file_tree_root, context.show_hidden, context)
             context.flat_file_list = filetree.flatten_tree(context.file_tree_root)
             context.filetree_selection_index = 0
+            win_size = None
+            pad_stale = True
+            context.dirty = True
         elif key == curses.KEY_PPAGE:
             if scroll_offset > 0:
                 scroll_offset = max(0, scroll_offset - 1)
+                context.dirty = True
         elif key == curses.KEY_NPAGE:
             if scroll_offset < max(0, len(context.flat_file_list) - context.height):
                 scroll_offset = min(len(context.flat_file_list) - 1, scroll_offset + 1)
+                context.dirty = True
+        elif key == curses.KEY_RESIZE:
+            context.height, context.width = context.stdscr.getmaxyx()
+            context.dirty = True
         elif key == 27:
             context.mode = "normal"
             return
 
+# Gutter strings ("-> 12 " / "   12 ") by line index, one dict per
+# indicator state. They only depend on the line number, so every buffer
+# shares them and they never need invalidating.
+_GUTTERS = ({}, {})
+
+def line_gutter(line_index, is_current_line):
+    """Return the cached indicator + line-number prefix for a text row."""
+    cache = _GUTTERS[is_current_line]
+    gutter = cache.get(line_index)
+    if gutter is None:
+        indicator = "-> " if is_current_line else "   "
+        gutter = cache[line_index] = f"{indicator}{line_index+1:<3}"
+    return gutter
+
+def put_row(stdscr, y, x, text, width, attr, prefix="", limit=None):
+    """
+    Write `prefix` and then at most `limit` characters of `text` at (y, x), and
+    fill the rest of the `width`-cell row in `attr`. `limit` defaults to what is
+    left of the row after the prefix. The text is cut by addnstr() and the fill
+    done by clrtoeol() with `attr` as background, so no sliced, joined or padded
+    string has to be built for every row.
+    """
+    if limit is None:
+        limit = width - len(prefix)
+    limit = max(0, limit)
+    try:
+        stdscr.bkgdset(' ', attr)
+        stdscr.addstr(y, x, prefix, attr)
+        stdscr.addnstr(text, limit, attr)
+        # A row that reaches the right edge has already wrapped the cursor
+        # to the next line; clearing there would wipe the next row's start
+        if len(prefix) + min(len(text), limit) < width:
+            stdscr.clrtoeol()
+    except curses.error:
+        pass
+
+def clamp_scroll(buf, visible_height):
+    """Adjust buf.scroll so the cursor line is inside the visible rows."""
+    if buf.cursor_line < buf.scroll:
+        buf.scroll = buf.cursor_line
+    if buf.cursor_line >= buf.scroll + visible_height:
+        buf.scroll = buf.cursor_line - visible_height + 1
+    if buf.scroll < 0:
+        buf.scroll = 0
+    if buf.scroll > max(0, len(buf.lines) - visible_height):
+        buf.scroll = max(0, len(buf.lines) - visible_height)
+
 def draw_search_preview(context, x_offset, visible_height):
     """
     In search mode, highlight the currently selected line in the main text area.
     """
-    lines = context.current_buffer.lines
-    if context.current_buffer.cursor_line < context.current_buffer.scroll:
-        context.current_buffer.scroll = context.current_buffer.cursor_line
-    if context.current_buffer.cursor_line >= context.current_buffer.scroll + visible_height:
-        context.current_buffer.scroll = context.current_buffer.cursor_line - visible_height + 1
-    if context.current_buffer.scroll < 0:
-        context.current_buffer.scroll = 0
-    if context.current_buffer.scroll > max(0, len(lines) - visible_height):
-        context.current_buffer.scroll = max(0, len(lines) - visible_height)
+    buf = context.current_buffer
+    clamp_scroll(buf, visible_height)
+    stdscr = context.stdscr
+    lines = buf.lines
+    n_lines = len(lines)
+    scroll = buf.scroll
+    cursor_line = buf.cursor_line
+    width = context.width - x_offset
     for i in range(visible_height):
-        line_index = context.current_buffer.scroll + i
-        if line_index < len(lines):
-            is_current_line = (line_index == context.current_buffer.cursor_line)
-            indicator = "-> " if is_current_line else "   "
-            line_number = f"{line_index+1:<3}"
-            prefix_len = 6
-            safe_line = lines[line_index][:max(0, context.width - x_offset - prefix_len)]
-            text = f"{indicator}{line_number}{safe_line}"
-            color = curses.color_pair(10) if is_current_line else curses.color_pair(2)
-            text_display = text.ljust(context.width - x_offset)
-            try:
-                context.stdscr.addstr(i, x_offset, text_display, color)
-            except curses.error:
-                pass
+        line_index = scroll + i
+        if line_index < n_lines:
+            is_current_line = (line_index == cursor_line)
+            color = ATTR_CUR if is_current_line else ATTR_TEXT
+            put_row(stdscr, i, x_offset, lines[line_index], width, color,
+                    prefix=line_gutter(line_index, is_current_line))
+        else:
+            put_row(stdscr, i, x_offset, "", width, ATTR_TEXT)
+
+def frame_state(context):
+    """
+    Return everything display() draws from as one tuple. When it equals the
+    previous frame's tuple nothing visible has changed (an unmapped key, an
+    unfinished prefix) and the whole redraw can be skipped.
+    """
+    buf = context.current_buffer
+    height, width = context.stdscr.getmaxyx()
+    flat = context.flat_file_list
+    sel = context.filetree_selection_index
+    expiry = context.help_mode_expiry
+    return (height, width, context.mode, context.command_buffer, _cached_hms(),
+            id(buf), buf.cursor_line, buf.cursor_col, buf.scroll, buf.modified, buf.mark_line,
+            buf.filename, context.current_buffer_index, len(context.buffers),
+            tuple(buf.lines[buf.scroll:buf.scroll + height]),
+            context.sidebar_visible, context.zen_mode, context.sidebar_help_mode,
+            expiry is not None and time.time() > expiry, tuple(context.sidebar_log),
+            context.current_theme, context.search_query, context.search_selected_index,
+            len(context.search_results), sel, context.filetree_scroll_offset, id(flat), len(flat),
+            flat[sel][0].expanded if 0 <= sel < len(flat) else None)
 
 def display(context):
     """
     Re-draw the entire screen: sidebar, main text area, status bar, and command-line dialog (if active).
+    When nothing visible changed since the last frame only the plugin draw hooks are run.
     """
+    state = frame_state(context)
+    if state == context.last_frame_state and not context.force_redraw:
+        # Plugin draw hooks still run once per frame: some track state
+        # (clipman's clipboard history) and draw over the unchanged screen.
+        context.plugin_manager.render(context)
+        context.stdscr.noutrefresh()
+        curses.doupdate()
+        return
+    context.last_frame_state = state
     context.height, context.width = context.stdscr.getmaxyx()
     visible_height = context.height - 1
 
@@ -1008,49 +1189,67 @@ def display(context):
         sidebar_width = 20
     else:
         sidebar_width = 0
-    context.stdscr.clear()
+    # Frames are drawn over the previous one and curses sends only the cells that
+    # differ from what the terminal shows. A forced redraw just blanks the virtual
+    # screen; the terminal itself is only cleared after a resize (clearok).
+    if context.force_redraw:
+        context.stdscr.erase()
+        context.last_render_key = None
+        context.force_redraw = False
     if context.sidebar_visible:
         draw_sidebar(context, sidebar_width)
 
     x_offset = sidebar_width
     text_area_width = context.width - x_offset
-    for i in range(visible_height):
-        try:
-            context.stdscr.addstr(i, x_offset, " " * text_area_width, curses.color_pair(2))
-        except curses.error:
-            pass
 
-    if context.mode == "search":
+    # The text area is only redrawn when something it shows changed. Lines are
+    # compared by identity first, so an unchanged view costs one tuple compare.
+    # The command box is drawn over the text, so command mode always redraws.
+    buf = context.current_buffer
+    clamp_scroll(buf, visible_height)
+    if context.mode == "command":
+        render_key = None
+    else:
+        render_key = (context.mode, x_offset, context.width, visible_height, context.zen_mode,
+                      id(buf), buf.scroll, buf.cursor_line,
+                      tuple(buf.lines[buf.scroll:buf.scroll + visible_height]))
+    if render_key is not None and render_key == context.last_render_key:
+        pass    # nothing in the text area changed
+    elif context.mode == "search":
         draw_search_preview(context, x_offset, visible_height)
     else:
-        lines = context.current_buffer.lines
-        if context.current_buffer.cursor_line < context.current_buffer.scroll:
-            context.current_buffer.scroll = context.current_buffer.cursor_line
-        if context.current_buffer.cursor_line >= context.current_buffer.scroll + visible_height:
-            context.current_buffer.scroll = context.current_buffer.cursor_line - visible_height + 1
-        if context.current_buffer.scroll < 0:
-            context.current_buffer.scroll = 0
-        if context.current_buffer.scroll > max(0, len(lines) - visible_height):
-            context.current_buffer.scroll = max(0, len(lines) - visible_height)
+        # per-frame constants bound to locals for the row loop
+        stdscr = context.stdscr
+        lines = buf.lines
+        n_lines = len(lines)
+        scroll = buf.scroll
+        cursor_line = buf.cursor_line
+        zen = context.zen_mode
+        blank_row = ord(' ') | ATTR_TEXT
         for i in range(visible_height):
-            line_index = context.current_buffer.scroll + i
-            if line_index < len(lines):
-                is_current_line = (line_index == context.current_buffer.cursor_line)
-                indicator = "-> " if is_current_line else "   "
-                if not context.zen_mode:
-                    line_number = f"{line_index+1:<3}"
+            line_index = scroll + i
+            if line_index < n_lines:
+                is_current_line = (line_index == cursor_line)
+                if not zen:
+                    prefix = line_gutter(line_index, is_current_line)
                     prefix_len = 7
                 else:
-                    line_number = ""
+                    prefix = "-> " if is_current_line else "   "
                     prefix_len = 0
-                safe_line = lines[line_index][:max(0, text_area_width - prefix_len)]
-                text = f"{indicator}{line_number}{safe_line}"
-                color = curses.color_pair(10) if is_current_line else curses.color_pair(2)
-                text_display = text.ljust(text_area_width)
+                color = ATTR_CUR if is_current_line else ATTR_TEXT
+                put_row(stdscr, i, x_offset, lines[line_index], text_area_width, color,
+                        prefix=prefix, limit=text_area_width - prefix_len)
+            else:
+                # rows past the end of the buffer are only background; on a
+                # terminal no wider than the sidebar x_offset is off screen
                 try:
-                    context.stdscr.addstr(i, x_offset, text_display, color)
+                    stdscr.hline(i, x_offset, blank_row, text_area_width)
                 except curses.error:
                     pass
+    context.last_render_key = render_key
+    # put_row leaves its fill attribute as the background; reset it so later
+    # plain addstr calls (status bar, plugins) are not tinted by it
+    context.stdscr.bkgdset(' ', 0)
 
     draw_status_bar(context)
     if context.mode == "command":
@@ -1070,9 +1269,12 @@ def display(context):
     context.plugin_manager.render(context)      # ← MUST be here
     # ----------------------------------------------------------------
 
-    context.stdscr.refresh()
+    # One doupdate() per frame: everything drawn above goes out in a single write
+    context.stdscr.noutrefresh()
+    curses.doupdate()
 
 
+@full_screen
 def prompt_input(context, prompt: str) -> str:
     """
     Prompt the user for input in a centered dialog box.
@@ -1081,49 +1283,156 @@ def prompt_input(context, prompt: str) -> str:
     old_mode = context.mode
     context.mode = "command"
     saved_command_buffer = context.command_buffer
+    # put back on exit: a plugin bind calling us expects blocking input after
+    saved_timeout = context.current_timeout
     context.command_buffer = ""
     curses.curs_set(1)
+    context.stdscr.bkgdset(' ', 0)
     try:
+        # bound once: these are called for every key and every frame
+        stdscr = context.stdscr
+        get_wch = stdscr.get_wch
+        box_height = 5
+        drawn_width = None
+        drawn_text = ""
+        drawn_cells = 0
+        # typed characters; joined only when drawn or returned. The layout works
+        # in screen cells, so each character's width is kept next to it.
+        chars = []
+        widths = []
+        n_cells = 0
+        win = None
+        # The screen behind the dialog is blanked once; after that only the
+        # dialog window itself is redrawn.
+        stdscr.erase()
+        stdscr.noutrefresh()
+        # Nothing in the dialog changes on its own (there is no clock to tick),
+        # so between keys getch() blocks instead of waking up on a timeout.
+        stdscr.timeout(-1)
+        context.dirty = True
+        draining = False
         while True:
-            context.stdscr.clear()
-            for y in range(context.height):
-                try:
-                    context.stdscr.addstr(y, 0, " " * context.width, curses.color_pair(0))
-                except curses.error:
-                    pass
-            box_width = max(40, len(prompt) + 10, len(context.command_buffer) + 10)
-            box_height = 5
-            start_y = (context.height - box_height) // 2
-            start_x = (context.width - box_width) // 2
-            top_border = "┌" + "─" * (box_width - 2) + "┐"
-            bottom_border = "└" + "─" * (box_width - 2) + "┘"
-            title = f" {prompt} "
-            if len(title) < box_width - 2:
-                title_start = (box_width - 2 - len(title)) // 2
-                top_line = ("┌" + " " * title_start + title +
-                            " " * (box_width - 2 - title_start - len(title)) + "┐")
-            else:
-                top_line = top_border
-            typed_str = context.command_buffer[:box_width - 4].ljust(box_width - 4)
-            content_line = "│ " + typed_str + " │"
+            if context.dirty and not draining:
+                # At most one frame per frame interval, as in the main loop; if the
+                # last one was too recent, wake up when the next one is due.
+                wait_ms = context.frame_interval_ms - (time.monotonic() - context.last_frame_time) * 1000
+                if wait_ms > 0:
+                    stdscr.timeout(int(wait_ms) + 1)
+                else:
+                    # The box grows with the input up to the screen width; past that
+                    # the field scrolls and shows the end of the text being typed.
+                    box_width = min(max(40, len(prompt) + 10, n_cells + 10), context.width)
+                    field = box_width - 4
+                    if n_cells <= field:
+                        first, shown_cells = 0, n_cells
+                    else:
+                        first, shown_cells = len(chars), 0
+                        while first and shown_cells + widths[first - 1] <= field:
+                            first -= 1
+                            shown_cells += widths[first]
+                    shown = "".join(chars[first:])
+                    # the cursor is left alone while the box is written and only
+                    # placed once at the end, right before the window is refreshed
+                    if win is not None:
+                        win.leaveok(True)
+                    if box_width != drawn_width:
+                        # The frame is only drawn when the box is (re)sized; otherwise
+                        # just the content line changes between keystrokes. The dialog
+                        # window is created once and then resized and moved; the rows it
+                        # covered are copied back from the blank screen in case it shrank.
+                        start_y, start_x, top_line, bottom_border = dialog_layout(
+                            prompt, box_width, context.width, context.height, box_height)
+                        win_width = min(box_width, context.width - start_x)
+                        if win is None:
+                            win = curses.newwin(3, win_width, start_y, start_x)
+                            # everything written to the dialog takes the box colour from
+                            # the window background, so no per-call attribute is needed
+                            win.bkgdset(' ', ATTR_BOX_BOLD)
+                            win.leaveok(True)
+                        else:
+                            stdscr.touchline(win.getbegyx()[0], 3)
+                            stdscr.noutrefresh()
+                            win.resize(3, win_width)
+                            win.mvwin(start_y, start_x)
+                        # The whole box in one write: every line is cut to exactly one
+                        # window row, so each wraps onto the next row by itself.
+                        content_line = "│ " + shown + _blank(field - shown_cells) + " │"
+                        frame = "".join(line[:win_width] for line in (top_line, content_line, bottom_border))
+                        try:
+                            win.addstr(0, 0, frame)
+                        except curses.error:
+                            pass    # writing the window's last cell raises after the cell is drawn
+                        drawn_width = box_width
+                    else:
+                        # Only rewrite from the first character that differs from what
+                        # is on screen, padding with spaces over a deleted tail.
+                        same = len(os.path.commonprefix((shown, drawn_text)))
+                        col = sum(widths[first:first + same])
+                        try:
+                            win.addstr(1, 2 + col,
+                                       shown[same:] + _blank(max(0, drawn_cells - shown_cells)))
+                        except curses.error:
+                            pass
+                    drawn_text = shown
+                    drawn_cells = shown_cells
+                    win.leaveok(False)
+                    win.move(1, 2 + shown_cells)
+                    win.noutrefresh()
+                    curses.doupdate()
+                    context.dirty = False
+                    context.last_frame_time = time.monotonic()
+            # get_wch() returns whole characters (str) rather than bytes, so
+            # non-ASCII input can be typed or pasted; special keys stay ints
             try:
-                context.stdscr.addstr(start_y, start_x, top_line, curses.color_pair(3) | curses.A_BOLD)
-                context.stdscr.addstr(start_y + 1, start_x, content_line, curses.color_pair(3) | curses.A_BOLD)
-                context.stdscr.addstr(start_y + 2, start_x, bottom_border, curses.color_pair(3) | curses.A_BOLD)
-                context.stdscr.move(start_y + 1, start_x + 2 + len(context.command_buffer))
+                key = get_wch()
             except curses.error:
-                pass
-            context.stdscr.refresh()
-            key = context.stdscr.getch()
+                key = -1
+            if context.dirty and not draining:
+                stdscr.timeout(-1)
+            if isinstance(key, str) and not key.isprintable():
+                key = ord(key)
+            if key == -1:
+                if draining:
+                    # input queue is empty again: redraw once and go back to waiting
+                    draining = False
+                    stdscr.timeout(-1)
+                continue
+            # ENTER and ESC return straight away, before anything is drawn for
+            # them; keys that change nothing fall through without a redraw
             if key in (curses.KEY_ENTER, 10):
-                return context.command_buffer.strip()
+                return "".join(chars).strip()
             elif key == 27:
                 return ""
             elif key in (8, curses.KEY_BACKSPACE, 127):
-                context.command_buffer = context.command_buffer[:-1]
-            elif 32 <= key <= 126:
-                context.command_buffer += chr(key)
+                # backspace on an empty field changes nothing, so it draws nothing
+                if chars:
+                    chars.pop()
+                    n_cells -= widths.pop()
+                    context.dirty = True
+            elif isinstance(key, str):
+                # combining marks take no cell of their own
+                w = max(0, wcwidth(key))
+                chars.append(key)
+                widths.append(w)
+                n_cells += w
+                context.dirty = True
+            elif key == curses.KEY_RESIZE:
+                # Blank the resized screen and build the dialog window again at
+                # its new position; the old one may no longer fit on screen.
+                context.height, context.width = stdscr.getmaxyx()
+                stdscr.clearok(True)
+                stdscr.erase()
+                stdscr.noutrefresh()
+                win = None
+                drawn_width = None
+                context.dirty = True
+            if context.dirty and not draining:
+                # Read whatever else is already queued (a paste arrives as a burst
+                # of keys) without waiting, so the dialog is redrawn once per burst.
+                draining = True
+                stdscr.timeout(0)
     finally:
+        context.set_input_timeout(saved_timeout)
         context.mode = old_mode
         context.command_buffer = saved_command_buffer
         curses.curs_set(0)